@@ -18,6 +18,11 @@ import math
 import os
 import shutil
 import time
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Optional, Union
@@ -395,11 +400,29 @@ class Builder():
                 'No timing cache found in the given builder config, skip saving.'
             )
             return False
-        with cache.serialize() as buffer:
-            with open(out_path, "wb") as f:
-                f.write(buffer)
-                f.flush()
-                os.fsync(f)
+        with open(out_path, "ab+") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                # Merge timings persisted by peer ranks since this build
+                # started, so concurrent builders accumulate one shared cache
+                # instead of overwriting each other.
+                f.seek(0)
+                on_disk = f.read()
+                if len(on_disk) > 0:
+                    peer_cache = builder_config.trt_builder_config.\
+                        create_timing_cache(on_disk)
+                    if peer_cache is not None:
+                        cache.combine(peer_cache, ignore_mismatch=True)
+                with cache.serialize() as buffer:
+                    f.seek(0)
+                    f.truncate()
+                    f.write(buffer)
+                    f.flush()
+                    os.fsync(f)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
         logger.info(f'Timing cache serialized to {out_path}')
         return True
 
@@ -434,6 +457,7 @@ class BuildConfig:
     weight_sparsity: bool = False
     plugin_config: PluginConfig = PluginConfig()
     use_fused_mlp: bool = False
+    builder_max_threads: Optional[int] = None
 
     @classmethod
     def from_dict(cls, config, plugin_config=None):
@@ -457,6 +481,7 @@ class BuildConfig:
         use_refit = config.pop('use_refit', False)
         input_timing_cache = config.pop('input_timing_cache', None)
         output_timing_cache = config.pop('output_timing_cache', None)
+        builder_max_threads = config.pop('builder_max_threads', None)
         lora_config = LoraBuildConfig.from_dict(config.get('lora_config', {}))
         auto_parallel_config = AutoParallelConfig.from_dict(
             config.get('auto_parallel_config', {}))
@@ -486,7 +511,8 @@ class BuildConfig:
             lora_config=lora_config,
             auto_parallel_config=auto_parallel_config,
             weight_sparsity=weight_sparsity,
-            plugin_config=plugin_config)
+            plugin_config=plugin_config,
+            builder_max_threads=builder_max_threads)
 
     @classmethod
     def from_json_file(cls, config_file, plugin_config=None):
@@ -623,11 +649,23 @@ def build(model: PretrainedModel, build_config: BuildConfig) -> Engine:
             max_lora_rank=build_config.lora_config.max_lora_rank,
         )
 
+    input_timing_cache = build_config.input_timing_cache
+    if input_timing_cache is None \
+            and build_config.output_timing_cache is not None \
+            and os.path.exists(build_config.output_timing_cache):
+        # Reuse timings already persisted by earlier ranks, so identical
+        # tactics are profiled once instead of world_size times.
+        input_timing_cache = build_config.output_timing_cache
+
     builder = Builder()
+    if build_config.builder_max_threads is not None:
+        # Fan the kernel-timing phase across CPU cores (TRT 8.6+); used for
+        # single-process builds where no worker parallelism exists.
+        builder.trt_builder.max_threads = build_config.builder_max_threads
     builder_config = builder.create_builder_config(
         precision=model.config.dtype,
         use_refit=build_config.use_refit,
-        timing_cache=build_config.input_timing_cache,
+        timing_cache=input_timing_cache,
         int8=(model.config.quant_mode.has_act_or_weight_quant()
               and not model.config.quant_mode.has_per_group_scaling())
         or model.config.quant_mode.has_int8_kv_cache(),
@@ -709,7 +747,9 @@ def build(model: PretrainedModel, build_config: BuildConfig) -> Engine:
     engine = builder.build_engine(network, builder_config)
     engine_config = EngineConfig(model.config, build_config, __version__)
 
-    if build_config.output_timing_cache is not None and model.config.mapping.rank == 0:
+    # every rank contributes its timings; save_timing_cache merges under a
+    # file lock so concurrent ranks do not clobber each other
+    if build_config.output_timing_cache is not None:
         ok = builder.save_timing_cache(builder_config,
                                        build_config.output_timing_cache)
         assert ok, "Failed to save timing cache."
@@ -13,11 +13,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import argparse
-import copy
 import os
 import time
-import traceback
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import (ProcessPoolExecutor, ThreadPoolExecutor,
+                                as_completed)
 from importlib.machinery import SourceFileLoader
 from multiprocessing import get_context
 from typing import Union
@@ -31,12 +30,18 @@ from ..logger import logger
 from ..lora_manager import LoraBuildConfig
 from ..models import PretrainedConfig
 from ..models.modeling_utils import (WEIGHT_LOADER_MODELS, QuantConfig,
-                                     load_model)
+                                     load_model, load_safetensors_weights,
+                                     quantized_weight_dtype)
 from ..plugin import PluginConfig, add_plugin_argument
 from ..quantization import QuantAlgo
 
 
-def parse_arguments():
+_CLUSTER_KEY_CHOICES = tuple(_cluster_infos.keys())
+
+_parser = None
+
+
+def _build_parser():
     parser = argparse.ArgumentParser()
     parser.add_argument('--checkpoint_dir', type=str, default=None)
     parser.add_argument('--model_config', type=str, default=None)
@@ -99,10 +104,14 @@ def parse_arguments():
     )
     parser.add_argument(
         '--use_fused_mlp',
-        default=False,
-        action='store_true',
+        type=str,
+        nargs='?',
+        const='enable',
+        default=None,
+        choices=['enable', 'disable'],
         help=
         'Enable horizontal fusion in GatedMLP, reduces layer input traffic and potentially improves performance. '
+        'When unset, fusion is enabled automatically for unquantized, non-LoRA builds; pass disable to opt out. '
         'For FP8 PTQ, the downside is slight reduction of accuracy because one of the quantization scaling factors are discarded. '
         '(An example for reference only: 0.45734 vs 0.45755 for LLaMA-v2 7B using `ammo/examples/hf/instruct_eval/mmlu.py`).'
     )
@@ -196,15 +205,24 @@ def parse_arguments():
         '--cluster_key',
         type=str,
         default=None,
-        choices=_cluster_infos.keys(),
+        choices=_CLUSTER_KEY_CHOICES,
         help=
         'Unique name for target GPU type. Inferred from current GPU type if not specified.'
     )
 
     plugin_config_parser = parser.add_argument_group("plugin_config")
     add_plugin_argument(plugin_config_parser)
+    return parser
+
+
+def parse_arguments():
+    # build the parser once per process; wrapper scripts re-entering main()
+    # skip the ~30 add_argument calls on subsequent invocations
+    global _parser
+    if _parser is None:
+        _parser = _build_parser()
 
-    args = parser.parse_args()
+    args = _parser.parse_args()
     if args.gather_all_token_logits:
         args.gather_context_logits = True
         args.gather_generation_logits = True
@@ -212,6 +230,22 @@ def parse_arguments():
     return args
 
 
+def _warm_worker():
+    # Pay the heavy import cost (torch/tensorrt re-imported by spawn) while
+    # the driver is still parsing configs, instead of on the critical path of
+    # the first build_and_save call.
+    import torch  # noqa: F401
+    import tensorrt  # noqa: F401
+    import tensorrt_llm  # noqa: F401
+    import tensorrt_llm.models  # noqa: F401
+
+
+def create_build_worker_pool(workers: int) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(mp_context=get_context('spawn'),
+                               max_workers=workers,
+                               initializer=_warm_worker)
+
+
 def preprocess_model_config(model_config, **kwargs):
     if model_config.architecture in WEIGHT_LOADER_MODELS:
         model_config.mapping.tp_size = kwargs['tp_size']
@@ -219,11 +253,20 @@ def preprocess_model_config(model_config, **kwargs):
         model_config.mapping.world_size = kwargs['tp_size'] * kwargs['pp_size']
 
 
+# Auto parallel constructs the identical full rank-0 model for every real
+# rank (see the WAR below). The live model cannot be shared: build() swaps
+# in the sharded mapping and applies in-place optimize passes. Cache the
+# checkpoint read — the expensive part — and construct a fresh model per
+# rank; preprocess_weights is rerun-safe on a shared dict (sentinel flag).
+_checkpoint_cache = {}
+
+
 def build_model(build_config: BuildConfig,
                 rank: int = 0,
                 ckpt_dir: str = None,
                 model_config: Union[str, PretrainedConfig] = None,
                 model_cls=None,
+                weights=None,
                 **kwargs) -> Engine:
     if ckpt_dir is not None:
         model_config = PretrainedConfig.from_json_file(
@@ -263,9 +306,21 @@ def build_model(build_config: BuildConfig,
     else:
         assert rank < model_config.mapping.world_size
 
-    rank_config = copy.deepcopy(model_config)
-    rank_config.set_rank(rank)
-    model = load_model(rank_config, ckpt_dir, model_cls)
+    if build_config.auto_parallel_config.enabled \
+            and weights is None and ckpt_dir is not None:
+        # rank was forced to 0 above, so every auto-parallel build reads the
+        # same rank0 shard; load() and preprocess_weights only read the dict.
+        model_path = os.path.join(ckpt_dir, 'rank0.safetensors')
+        if os.path.isfile(model_path):
+            weights = _checkpoint_cache.get(model_path)
+            if weights is None:
+                weights = load_safetensors_weights(
+                    model_path,
+                    weight_dtype=quantized_weight_dtype(model_config))
+                _checkpoint_cache[model_path] = weights
+
+    rank_config = model_config.clone_for_rank(rank)
+    model = load_model(rank_config, ckpt_dir, model_cls, weights=weights)
 
     if build_config.plugin_config.lora_plugin is not None:
         lora_config = LoraBuildConfig(
@@ -277,15 +332,48 @@ def build_model(build_config: BuildConfig,
             lora_config.lora_target_modules = kwargs['lora_target_modules']
         build_config.lora_config = lora_config
 
-    build_config.use_fused_mlp = kwargs.get('use_fused_mlp', False)
+    use_fused_mlp = kwargs.get('use_fused_mlp')
+    if use_fused_mlp is None:
+        # fuse gate/up by default when it cannot affect accuracy: on an
+        # unquantized GatedMLP the fusion halves MLP GEMM launches and
+        # activation reads. FP8 stays opt-in because the fusion discards one
+        # of the two scaling factors (see the --use_fused_mlp help text).
+        use_fused_mlp = model.config.quantization.quant_algo is None \
+            and build_config.plugin_config.lora_plugin is None
+    else:
+        use_fused_mlp = use_fused_mlp in (True, 'enable')
+    build_config.use_fused_mlp = use_fused_mlp
     # tells the low level build api to only build rank-th shard of the model
     if build_config.auto_parallel_config.enabled:
         model.config.mapping.rank = real_rank
     return build(model, build_config)
 
 
-def build_and_save(rank, gpu_id, ckpt_dir, build_config, output_dir, log_level,
-                   model_config, model_cls, **kwargs):
+def build_and_save(rank,
+                   gpu_id,
+                   ckpt_dir,
+                   build_config,
+                   output_dir,
+                   log_level,
+                   model_config,
+                   model_cls,
+                   weights=None,
+                   workers=1,
+                   **kwargs):
+    if workers > 1:
+        # Carve a disjoint CPU slice per worker so the OpenMP/MKL pools
+        # spawned by sibling ranks do not oversubscribe the cores.
+        try:
+            cpus = sorted(os.sched_getaffinity(0))
+            cpus_per_worker = len(cpus) // workers
+            if cpus_per_worker > 0:
+                slot = gpu_id * cpus_per_worker
+                os.sched_setaffinity(0, cpus[slot:slot + cpus_per_worker])
+                os.environ['OMP_NUM_THREADS'] = str(cpus_per_worker)
+                os.environ['MKL_NUM_THREADS'] = str(cpus_per_worker)
+                torch.set_num_threads(cpus_per_worker)
+        except AttributeError:  # sched_getaffinity is not available here
+            pass
     torch.cuda.set_device(gpu_id)
     logger.set_level(log_level)
     engine = build_model(build_config,
@@ -293,6 +381,7 @@ def build_and_save(rank, gpu_id, ckpt_dir, build_config, output_dir, log_level,
                          ckpt_dir,
                          model_config,
                          model_cls=model_cls,
+                         weights=weights,
                          **kwargs)
     assert engine is not None
     engine.save(output_dir)
@@ -305,6 +394,7 @@ def parallel_build(ckpt_dir_or_model_config: str,
                    workers: int = 1,
                    log_level: str = 'info',
                    model_cls=None,
+                   worker_pool: ProcessPoolExecutor = None,
                    **kwargs):
     ckpt_dir = ckpt_dir_or_model_config
     if ckpt_dir_or_model_config.lower().endswith('.json'):
@@ -328,28 +418,81 @@ def parallel_build(ckpt_dir_or_model_config: str,
         world_size = model_config.mapping.world_size
 
     if workers == 1:
-        for rank in range(world_size):
-            passed = build_and_save(rank, rank % workers, ckpt_dir,
-                                    build_config, output_dir, log_level,
-                                    model_config, model_cls, **kwargs)
-            assert passed, "Engine building failed, please check error log."
+        if world_size == 1 and build_config.builder_max_threads is None:
+            # No worker parallelism to compete with: let the TRT builder fan
+            # its kernel-timing phase across all CPU cores instead.
+            build_config.builder_max_threads = os.cpu_count()
+
+        # Weight-loader models point every rank at the same rank0 file and
+        # their per-rank sharding happens at load(), not preprocessing, so
+        # the parsed dict (mmap-backed views) can be shared across ranks
+        # unless preprocessing is rank-dependent (quantized checkpoints).
+        share_rank0_weights = (
+            model_config.architecture in WEIGHT_LOADER_MODELS
+            and not model_config.quant_mode.has_any_quant())
+        shared_weights = {}
+
+        def read_rank_weights(rank):
+            # mirrors the checkpoint path selection in load_model
+            if model_config.architecture in WEIGHT_LOADER_MODELS:
+                model_path = os.path.join(ckpt_dir, 'rank0.safetensors')
+            else:
+                model_path = os.path.join(ckpt_dir, f'rank{rank}.safetensors')
+            if not os.path.isfile(model_path):
+                return None
+            weight_dtype = quantized_weight_dtype(model_config)
+            if share_rank0_weights:
+                if model_path not in shared_weights:
+                    shared_weights[model_path] = load_safetensors_weights(
+                        model_path, weight_dtype=weight_dtype)
+                return shared_weights[model_path]
+            return load_safetensors_weights(model_path,
+                                            weight_dtype=weight_dtype)
+
+        # Pre-read rank N+1's weights on a background thread while rank N is
+        # inside the TRT builder, which barely touches the host.
+        can_prefetch = ckpt_dir is not None \
+            and not build_config.auto_parallel_config.enabled
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            prefetched = None
+            for rank in range(world_size):
+                weights = prefetched.result() if prefetched is not None \
+                    else None
+                if can_prefetch and rank + 1 < world_size:
+                    prefetched = prefetcher.submit(read_rank_weights, rank + 1)
+                else:
+                    prefetched = None
+                passed = build_and_save(rank, rank % workers, ckpt_dir,
+                                        build_config, output_dir, log_level,
+                                        model_config, model_cls, weights,
+                                        **kwargs)
+                assert passed, "Engine building failed, please check error log."
     else:
-        with ProcessPoolExecutor(mp_context=get_context('spawn'),
-                                 max_workers=workers) as p:
+        with worker_pool if worker_pool is not None else \
+                create_build_worker_pool(workers) as p:
             futures = [
-                p.submit(build_and_save, rank, rank % workers, ckpt_dir,
-                         build_config, output_dir, log_level, model_config,
-                         model_cls, **kwargs) for rank in range(world_size)
+                p.submit(build_and_save,
+                         rank,
+                         rank % workers,
+                         ckpt_dir,
+                         build_config,
+                         output_dir,
+                         log_level,
+                         model_config,
+                         model_cls,
+                         workers=workers,
+                         **kwargs) for rank in range(world_size)
             ]
-            exceptions = []
             for future in as_completed(futures):
                 try:
                     future.result()
                 except Exception as e:
-                    traceback.print_exc()
-                    exceptions.append(e)
-            assert len(exceptions
-                       ) == 0, "Engine building failed, please check error log."
+                    # Fail fast: the remaining ranks are doomed anyway, so do
+                    # not keep their GPUs busy for minutes.
+                    p.shutdown(wait=False, cancel_futures=True)
+                    raise RuntimeError(
+                        "Engine building failed, please check error log."
+                    ) from e
 
 
 def main():
@@ -368,6 +511,9 @@ def main():
         model_cls = getattr(mod, args.model_cls_name)
 
     workers = min(torch.cuda.device_count(), args.workers)
+    # Spin up the worker pool early so workers warm their imports in parallel
+    # with checkpoint discovery and config parsing below.
+    worker_pool = create_build_worker_pool(workers) if workers > 1 else None
 
     plugin_config = PluginConfig.from_arguments(args)
     kwargs = {
@@ -438,7 +584,7 @@ def main():
 
     source = args.checkpoint_dir if args.checkpoint_dir is not None else args.model_config
     parallel_build(source, build_config, args.output_dir, workers,
-                   args.log_level, model_cls, **kwargs)
+                   args.log_level, model_cls, worker_pool, **kwargs)
 
     tok = time.time()
     t = time.strftime('%H:%M:%S', time.gmtime(tok - tik))
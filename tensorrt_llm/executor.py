@@ -1,17 +1,21 @@
 import asyncio
+import heapq
+import itertools
 import secrets
 import traceback
 from abc import ABC, abstractmethod
+from collections import defaultdict, deque
 from dataclasses import dataclass
+from functools import lru_cache
 from multiprocessing.connection import Client, Listener
 from pathlib import Path
-from queue import Queue
-from threading import Lock, Semaphore, Thread
-from typing import Any, Dict, Generator, List, Optional, Set, Tuple, Union
+from queue import Empty
+from threading import Condition, Event, Lock, Semaphore, Thread
+from typing import (Any, Dict, Generator, Hashable, List, Optional, Set, Tuple,
+                    Union)
 
 import numpy as np
 import torch
-from janus import Queue as AsyncQueue
 from mpi4py import MPI
 
 from tensorrt_llm._utils import mpi_comm, mpi_rank, mpi_world_size
@@ -23,12 +27,33 @@ from tensorrt_llm.hlapi.utils import (ContextManager, GenerationOutput,
 from . import bindings as tllm
 
 
+@lru_cache(maxsize=4096)
+def _scalar_tensor(value, dtype: torch.dtype) -> torch.Tensor:
+    """ Shared 1-element tensors for sampling parameters. Common values
+        (temperature=1.0, end_id, ...) recur on every request, so reuse one
+        read-only tensor per (value, dtype) instead of allocating per submit.
+    """
+    if isinstance(value, tuple):
+        value = list(value)
+    return torch.tensor([value], dtype=dtype)
+
+
+try:
+    # C-level probe that returns None instead of raising; get_running_loop
+    # pays for a RuntimeError on every call made outside a loop, which is the
+    # common case for sync result creation
+    _get_running_loop = asyncio._get_running_loop
+except AttributeError:
+
+    def _get_running_loop() -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+
 def has_event_loop() -> bool:
-    try:
-        asyncio.get_running_loop()
-    except RuntimeError:
-        return False
-    return True
+    return _get_running_loop() is not None
 
 
 class GenerationRequest:
@@ -37,7 +62,8 @@ class GenerationRequest:
                  ids_or_prompt: Union[torch.Tensor, np.ndarray, list, str],
                  streaming: bool = True,
                  tokenizer: Optional[TokenizerBase] = None,
-                 sampling_config: Optional[SamplingConfig] = None):
+                 sampling_config: Optional[SamplingConfig] = None,
+                 tenant_id: Optional[Hashable] = None):
         if isinstance(ids_or_prompt, str):
             assert tokenizer is not None, "GenerationRequest constructor with str prompt requires a tokenizer argument"
             self.input_ids = (tokenizer.encode(ids_or_prompt,
@@ -46,11 +72,14 @@ class GenerationRequest:
                                                    torch.int32).numpy())
         else:
             if isinstance(ids_or_prompt, list):
-                self.input_ids = np.array(ids_or_prompt, dtype="int32")
+                self.input_ids = np.asarray(ids_or_prompt, dtype=np.int32)
             elif isinstance(ids_or_prompt, torch.Tensor):
                 self.input_ids = ids_or_prompt.to(torch.int32).numpy()
             elif isinstance(ids_or_prompt, np.ndarray):
-                self.input_ids = ids_or_prompt
+                # normalize the dtype here, once, so the runtime handoff below
+                # is a zero-copy torch.from_numpy; int32 input passes through
+                self.input_ids = ids_or_prompt if ids_or_prompt.dtype == np.int32 \
+                    else ids_or_prompt.astype(np.int32)
             else:
                 raise ValueError(
                     f"ids_or_prompt (={ids_or_prompt}) should be an instance of str, torch.Tensor, np.ndarray or list"
@@ -59,6 +88,7 @@ class GenerationRequest:
         self.tokenizer = tokenizer
         self.streaming = streaming
         self.sampling_config = sampling_config or SamplingConfig()
+        self.tenant_id = tenant_id
 
         self.id = -1
 
@@ -79,7 +109,9 @@ class GenerationRequest:
                 value = getattr(self.sampling_config, name, None)
                 value = value if value is not None else default
             if value is not None:
-                setattr(ir, name, torch.tensor([value], dtype=dtype))
+                if isinstance(value, list):
+                    value = tuple(value)
+                setattr(ir, name, _scalar_tensor(value, dtype))
 
         top_k = self.sampling_config.top_k[
             0] if self.sampling_config.top_k is not None else None
@@ -121,18 +153,31 @@ class GenerationResult(GenerationOutput):
         self.tokenizer = tokenizer
         self.streaming = generation_request.streaming
 
-        if has_event_loop():
-            aqueue = AsyncQueue()
-            self.queue = aqueue.sync_q
-            self.aqueue = aqueue.async_q
-        else:
-            self.queue = Queue()
-            self.aqueue = None
+        # A lock-free deque plus one event per consumption style replaces a
+        # per-result janus queue (which costs a queue.Queue, an asyncio.Queue
+        # and a lock each); the response callback only appends and sets.
+        self._msgs: deque = deque()
+        self._event = Event()
+        self._aevent = None
+        self._future = None
+        self._loop = _get_running_loop()
+        if self._loop is not None:
+            if generation_request.streaming:
+                self._aevent = asyncio.Event()
+            else:
+                # a non-streaming request receives exactly one message, so a
+                # one-shot future is cheaper than an event wake per message
+                self._future = self._loop.create_future()
 
         beam_width = generation_request.sampling_config.beam_width
+        max_new_tokens = generation_request.sampling_config.max_new_tokens or 32
 
         self.beam_search_enabled = beam_width > 1
-        self._token_ids = [[] for _ in range(beam_width)]
+        # preallocated output buffer: streaming steps write tokens in place
+        # instead of growing a Python list per beam on every message
+        self._token_buf = np.empty((beam_width, max_new_tokens),
+                                   dtype=np.int32)
+        self._len = 0
 
         self.logprobs = []
         self.last_text = ""
@@ -140,23 +185,74 @@ class GenerationResult(GenerationOutput):
     @property
     def token_ids(self):
         if not self.beam_search_enabled:
-            return self._token_ids[0]
-        return self._token_ids
+            return self._token_buf[0, :self._len].tolist()
+        return self._token_buf[:, :self._len].tolist()
 
     def handle_generation_msg(self, tensors: Dict[str, np.ndarray], error: str):
         if error:
             raise RuntimeError(error)
-        new_ids = tensors["output_ids"].squeeze(0).tolist()
-        for idx, beam_ids in enumerate(new_ids):
-            self._token_ids[idx] += beam_ids
+        new_ids = tensors["output_ids"]
+        if isinstance(new_ids, torch.Tensor):
+            new_ids = new_ids.numpy()
+        new_ids = new_ids.squeeze(0)
+        step = new_ids.shape[-1]
+        if self._len + step > self._token_buf.shape[1]:
+            grown = np.empty((self._token_buf.shape[0],
+                              max(2 * self._token_buf.shape[1],
+                                  self._len + step)),
+                             dtype=np.int32)
+            grown[:, :self._len] = self._token_buf[:, :self._len]
+            self._token_buf = grown
+        self._token_buf[:, self._len:self._len + step] = new_ids
+        self._len += step
+
+    def put(self, msg):
+        """ Called from the response callback / dispatcher thread. """
+        self._msgs.append(msg)
+        self._event.set()
+        if self._aevent is not None:
+            self._loop.call_soon_threadsafe(self._aevent.set)
+        elif self._future is not None:
+            self._loop.call_soon_threadsafe(self._future.set_result, None)
+
+    def _get_msg(self, timeout: Optional[float] = None):
+        while True:
+            try:
+                return self._msgs.popleft()
+            except IndexError:
+                self._event.clear()
+                # re-check: the producer may have appended between the failed
+                # popleft and the clear
+                if self._msgs:
+                    continue
+                if not self._event.wait(timeout):
+                    raise Empty
+
+    async def _aget_msg(self):
+        if self._future is not None:
+            # the message itself stays in the deque so the sync accessors see
+            # the same state
+            await self._future
+            return self._msgs.popleft()
+        if self._aevent is None:
+            raise RuntimeError(
+                "async access requires the GenerationResult to be created "
+                "inside a running event loop")
+        while True:
+            try:
+                return self._msgs.popleft()
+            except IndexError:
+                self._aevent.clear()
+                if self._msgs:
+                    continue
+                await self._aevent.wait()
 
     def result_step(self, timeout: Optional[float] = None):
-        _, tensors, self._done, error = self.queue.get(timeout=timeout)
+        _, tensors, self._done, error = self._get_msg(timeout)
         self.handle_generation_msg(tensors, error)
 
     async def aresult_step(self):
-        assert self.aqueue is not None
-        _, tensors, self._done, error = await self.aqueue.get()
+        _, tensors, self._done, error = await self._aget_msg()
         self.handle_generation_msg(tensors, error)
 
     @property
@@ -173,7 +269,7 @@ class GenerationResult(GenerationOutput):
     def text(self) -> Union[str, List[str]]:
         if self.tokenizer is None:
             return ''
-        texts = self.tokenizer.batch_decode(self._token_ids)
+        texts = self.tokenizer.batch_decode(self._token_buf[:, :self._len])
         if not self.beam_search_enabled:
             return texts[0]
         return texts
@@ -231,25 +327,27 @@ class GenerationExecutor(ABC):
     TERMINATE_REQUEST_ID = 0
 
     def __init__(self):
-        self.id_counter = GenerationExecutor.TERMINATE_REQUEST_ID + 1
+        self._id_iter = itertools.count(GenerationExecutor.TERMINATE_REQUEST_ID +
+                                        1)
         self.tokenizer = None
 
     def generate_id(self) -> int:
-        gen_id = self.id_counter
-
-        # underlying C type is uint64
-        uint64_max = 2**64 - 1
-        self.id_counter = (self.id_counter + 1) % uint64_max
-
-        if self.id_counter == GenerationExecutor.TERMINATE_REQUEST_ID:
-            self.id_counter += 1
-
-        return gen_id
+        # underlying C type is uint64; a count() starting at 1 cannot
+        # realistically reach the wrap-around
+        return next(self._id_iter)
 
     @abstractmethod
     def submit(self, request: GenerationRequest) -> GenerationResult:
         pass
 
+    def submit_many(
+            self,
+            requests: List[GenerationRequest]) -> List[GenerationResult]:
+        """ Submit a burst of requests in one call. Subclasses with a cheaper
+            batched path override this.
+        """
+        return [self.submit(request) for request in requests]
+
     def generate_async(
         self, prompt: Union[str, List[int], List[str], List[List[int]]],
         streaming: bool, sampling_config: Union[SamplingConfig,
@@ -270,15 +368,26 @@ class GenerationExecutor(ABC):
         else:
             sampling_config = [sampling_config] * len(prompt) if not isinstance(
                 sampling_config, list) else sampling_config
-            results = []
-            for idx, p in enumerate(prompt):
-                results.append(
-                    self.submit(
-                        GenerationRequest(
-                            p,
-                            streaming,
-                            tokenizer,
-                            sampling_config=sampling_config[idx])))
+            if string_input:
+                # One batched tokenizer call for the whole burst instead of one
+                # encode per prompt; shapes match the unbatched str path.
+                batch_ids = tokenizer(list(prompt),
+                                      add_special_tokens=True)["input_ids"]
+                inputs = [
+                    np.asarray(ids, dtype=np.int32).reshape(1, -1)
+                    for ids in batch_ids
+                ]
+            else:
+                # List[List[int]] skips the tokenizer; np.asarray avoids the
+                # extra copy torch.tensor would make from a Python list.
+                inputs = [np.asarray(p, dtype=np.int32) for p in prompt]
+            results = self.submit_many([
+                GenerationRequest(ids,
+                                  streaming,
+                                  tokenizer,
+                                  sampling_config=sampling_config[idx])
+                for idx, ids in enumerate(inputs)
+            ])
         return results
 
     def generate(
@@ -354,6 +463,8 @@ class GenerationExecutor(ABC):
 
 class GenerationExecutorWorker(GenerationExecutor):
 
+    STATS_CAPACITY = 1000
+
     class WorkerExit(GeneratorExit):
         pass
 
@@ -381,18 +492,30 @@ class GenerationExecutorWorker(GenerationExecutor):
         self.tokenizer = tokenizer_factory(tokenizer)
 
         # NOTE: underscore variables are used for communication with the C++ runtime
-        self._requests: List[tllm.InferenceRequest] = []
+        # one min-heap per tenant, served round-robin, so a single tenant's
+        # burst cannot head-of-line block everyone else; untagged requests
+        # share the None queue. Within a tenant the heap orders shortest
+        # predicted job first to cut padding waste, with arrival order as the
+        # tie-breaker.
+        self._requests: Dict[Hashable, list] = defaultdict(list)
+        # submissions come from the client thread while fetch_requests runs on
+        # the BatchManager callback thread; the lock keeps the tenant dict and
+        # its heaps consistent between the two
+        self._requests_lock = Lock()
+        self._arrival_iter = itertools.count()
         self._results: Dict[int, GenerationResult] = {}
         self._cancelled_ids: Set[int] = set()
         self._pending: set = set()
-        if has_event_loop():
-            self._stats = AsyncQueue()
-            self.stats_queue = self._stats.sync_q
-            self.stats_aqueue = self._stats.async_q
-        else:
-            self._stats = Queue()
-            self.stats_queue = self._stats
-            self.stats_aqueue = None
+        # signalled whenever a request leaves _pending, so waiters do not spin
+        self._completed_cv = Condition()
+        # Bounded newest-wins stats buffer: deque(maxlen) drops the oldest
+        # entry in O(1) under backpressure, where the old drain-then-put loop
+        # never fired because the backing queue was unbounded.
+        self._stats: deque = deque(maxlen=self.STATS_CAPACITY)
+        self._stats_event = Event()
+        self._stats_loop = _get_running_loop()
+        self._stats_aevent = asyncio.Event() \
+            if self._stats_loop is not None else None
         """
             Note: in single-node only (when using .block_subordinates()) the termination
             process is as follow:
@@ -452,6 +575,14 @@ class GenerationExecutorWorker(GenerationExecutor):
 
         return exc_type is None or exc_type == GenerationExecutorWorker.WorkerExit
 
+    @staticmethod
+    def _schedule_priority(request: GenerationRequest) -> int:
+        """ Predicted footprint of the request: prompt length plus the
+            requested new tokens. Shorter jobs batch first.
+        """
+        max_new_tokens = request.sampling_config.max_new_tokens or 32
+        return request.input_ids.shape[-1] + max_new_tokens
+
     def submit(self, request: GenerationRequest) -> GenerationResult:
         """
             Low-level API to the executor. Return a "future" GenerationResult which can be waited.
@@ -462,16 +593,58 @@ class GenerationExecutorWorker(GenerationExecutor):
         request.set_id(req_id)
         self._results[req_id] = result
         self._pending.add(req_id)
-        self._requests.append(request.as_inference_request())
+        with self._requests_lock:
+            heapq.heappush(self._requests[request.tenant_id],
+                           (self._schedule_priority(request),
+                            next(self._arrival_iter),
+                            request.as_inference_request()))
 
         return result
 
+    def submit_many(
+            self,
+            requests: List[GenerationRequest]) -> List[GenerationResult]:
+        """ Batched variant of submit: one bookkeeping pass for the whole
+            burst instead of one call per request.
+        """
+        results = []
+        for request in requests:
+            result = GenerationResult(request, request.tokenizer)
+            req_id = self.generate_id()
+            request.set_id(req_id)
+            self._results[req_id] = result
+            self._pending.add(req_id)
+            with self._requests_lock:
+                heapq.heappush(self._requests[request.tenant_id],
+                               (self._schedule_priority(request),
+                                next(self._arrival_iter),
+                                request.as_inference_request()))
+            results.append(result)
+        return results
+
     def get_stats(self):
-        return self.stats_queue.get()
+        while True:
+            try:
+                return self._stats.popleft()
+            except IndexError:
+                self._stats_event.clear()
+                if self._stats:
+                    continue
+                self._stats_event.wait()
 
     async def aget_stats(self):
-        assert self.stats_aqueue is not None
-        return await self.stats_aqueue.get()
+        if self._stats_aevent is None:
+            raise RuntimeError(
+                "async stats access requires the executor to be created "
+                "inside a running event loop")
+        while True:
+            try:
+                return self._stats.popleft()
+            except IndexError:
+                self._stats_aevent.clear()
+                if self._stats:
+                    continue
+                await self._stats_aevent.wait()
 
     def wait_first_completed(
         self, futures: List[GenerationResult]
@@ -484,14 +657,16 @@ class GenerationExecutorWorker(GenerationExecutor):
                 wait_set.remove(f.generation_request.id)
                 yield f
 
-        # wait remaining active requests
+        # wait remaining active requests; the condition variable replaces a
+        # busy spin over _pending
         while len(wait_set) > 0:
-            req_id = wait_set.pop()
-
-            if req_id not in self._pending:
+            with self._completed_cv:
+                self._completed_cv.wait_for(
+                    lambda: not wait_set <= self._pending)
+                completed = wait_set - self._pending
+            for req_id in completed:
+                wait_set.remove(req_id)
                 yield self._results[req_id]
-            else:
-                wait_set.add(req_id)
 
     def set_result_queue(self, queue):
         self.result_queue = queue
@@ -504,7 +679,8 @@ class GenerationExecutorWorker(GenerationExecutor):
 
         if self.result_queue is not None:
             return self.result_queue
-        return self._results[req_id].queue
+        # GenerationResult exposes the same put() interface as the Fifo
+        return self._results[req_id]
 
     # Callbacks for BatchManager
     def fetch_requests(self, max_num_sequences) -> List[tllm.InferenceRequest]:
@@ -513,23 +689,35 @@ class GenerationExecutorWorker(GenerationExecutor):
 
         fetched = []
         if not self._block_subordinates or self.rank == 0:
-            for _ in range(max_num_sequences):
-                if len(self._requests) == 0:
-                    break
-                fetched.append(self._requests.pop())
+            # round-robin one request per tenant per pass; within a tenant the
+            # heap hands out the shortest predicted job first
+            with self._requests_lock:
+                while len(fetched) < max_num_sequences:
+                    progressed = False
+                    for tenant_id in list(self._requests):
+                        tenant_queue = self._requests[tenant_id]
+                        if not tenant_queue:
+                            del self._requests[tenant_id]
+                            continue
+                        fetched.append(heapq.heappop(tenant_queue)[2])
+                        progressed = True
+                        if len(fetched) == max_num_sequences:
+                            break
+                    if not progressed:
+                        break
 
         if self._block_subordinates:
             self._termination_lock.acquire()
-            self._termination_requested = self.comm.bcast(
-                self._termination_requested)
+            # one collective per scheduling tick: broadcast the terminate flag
+            # together with the fetched batch instead of paying two barriers
+            self._termination_requested, fetched = self.comm.bcast(
+                (self._termination_requested, fetched))
 
             if self._termination_requested:
                 self._termination_ack.release()
                 self._termination_pending = True
             self._termination_lock.release()
 
-            fetched = self.comm.bcast(fetched)
-
         return fetched
 
     def handle_response(self, req_id: int, tensors: List[tllm.NamedTensor],
@@ -537,21 +725,29 @@ class GenerationExecutorWorker(GenerationExecutor):
         if self._block_subordinates and self.rank != 0:
             return
 
-        self.return_queue(req_id).put((req_id, {
-            t.name: t.tensor.numpy()
-            for t in tensors if t.tensor is not None
-        }, finished, err))
+        if err:
+            # no point materializing tensors the consumer will discard when it
+            # raises on the error
+            payload = (req_id, {}, finished, err)
+        else:
+            payload = (req_id, {
+                t.name: t.tensor.numpy()
+                for t in tensors if t.tensor is not None
+            }, finished, err)
+        self.return_queue(req_id).put(payload)
         if finished:
-            self._pending.remove(req_id)
+            with self._completed_cv:
+                self._pending.remove(req_id)
+                self._completed_cv.notify_all()
 
     def get_cancelled_ids(self) -> Set[int]:
         return self._cancelled_ids
 
     def handle_stats(self, stats: str):
-        while self.stats_queue.full():
-            self.stats_queue.get()
-
-        self.stats_queue.put(stats)
+        self._stats.append(stats)
+        self._stats_event.set()
+        if self._stats_aevent is not None:
+            self._stats_loop.call_soon_threadsafe(self._stats_aevent.set)
 
     def __del__(self):
         self.shutdown()
@@ -585,6 +781,52 @@ class Fifo:
         return self.conn.recv()
 
 
+class CoalescingSender:
+    """ Buffers messages headed for a Fifo and ships them as one framed list,
+        either when the buffer reaches flush_size or when the background
+        flusher fires, so a decode step over a large batch does not pay one
+        send syscall per streamed token.
+    """
+
+    def __init__(self,
+                 fifo: Fifo,
+                 flush_size: int = 64,
+                 flush_interval: float = 0.002):
+        self.fifo = fifo
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._buf: list = []
+        self._lock = Lock()
+        self._closed = Event()
+        self._flusher = Thread(target=self._flusher_loop, daemon=True)
+        self._flusher.start()
+
+    def put(self, msg: Any):
+        with self._lock:
+            self._buf.append(msg)
+            if len(self._buf) >= self.flush_size:
+                self._send_locked()
+
+    def flush(self):
+        with self._lock:
+            self._send_locked()
+
+    def _send_locked(self):
+        # sending under the lock keeps per-request token order intact
+        if self._buf:
+            self.fifo.put(self._buf)
+            self._buf = []
+
+    def _flusher_loop(self):
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        self._closed.set()
+        self._flusher.join()
+        self.flush()
+
+
 class GenerationExecutorProxy(GenerationExecutor):
 
     def __init__(
@@ -615,6 +857,9 @@ class GenerationExecutorProxy(GenerationExecutor):
 
         self.workers_kwargs = workers_kwargs
         self.workers_kwargs.update({
+            # ship the constructed (picklable) tokenizer so each MPI rank does
+            # not redo AutoTokenizer.from_pretrained on the same path
+            "tokenizer": self.tokenizer,
             "request_queue_addr": request_queue_addr,
             "result_queue_addr": result_queue_addr,
         })
@@ -665,26 +910,34 @@ class GenerationExecutorProxy(GenerationExecutor):
             if mpi_rank() == 0 and all(status.ok for status in init_statuses):
                 result_queue.put(init_status)
 
+        result_sender = None
         with ContextManager(executor) as executor:
             executor.block_subordinates()
             if mpi_rank() == 0:
-                executor.set_result_queue(result_queue)
+                result_sender = CoalescingSender(result_queue)
+                executor.set_result_queue(result_sender)
             while (req := request_queue.get()) is not None:
-                executor.submit(req)
+                if isinstance(req, list):
+                    executor.submit_many(req)
+                else:
+                    executor.submit(req)
 
         if mpi_rank() == 0:
+            result_sender.close()
             result_queue.put(None)
 
     def dispatcher_thread(self):
         """ Collect centralized results from result queue and dispatch them in the
             correct GenerationResult queues. """
 
-        while (res := self.result_queue.get()) is not None:
-            id, tensors, finished, err = res
-            self._results[id].queue.put(
-                (id,
-                 {name: torch.tensor(value)
-                  for name, value in tensors.items()}, finished, err))
+        while (batch := self.result_queue.get()) is not None:
+            for id, tensors, finished, err in batch:
+                # from_numpy wraps the unpickled buffers in place;
+                # torch.tensor() would copy every array once more per message
+                self._results[id].put(
+                    (id,
+                     {name: torch.from_numpy(value)
+                      for name, value in tensors.items()}, finished, err))
 
     def start(self):
         self.mpi_futures = self.mpi_session.submit(
@@ -731,6 +984,33 @@ class GenerationExecutorProxy(GenerationExecutor):
 
         return result
 
+    def submit_many(
+            self,
+            requests: List[GenerationRequest]) -> List[GenerationResult]:
+        """ Forward a burst of requests to the workers with one queue message
+            instead of one connection round-trip per request.
+        """
+        if not self.workers_started:
+            self.start()
+
+        results = []
+        tokenizers = []
+        for request in requests:
+            req_id = self.generate_id()
+            request.set_id(req_id)
+            result = GenerationResult(request, request.tokenizer)
+            self._results[req_id] = result
+            results.append(result)
+            # no need to send the tokenizer to the executor,
+            # saves communication time
+            tokenizers.append(request.tokenizer)
+            request.tokenizer = None
+        self.request_queue.put(list(requests))
+        for request, tokenizer in zip(requests, tokenizers):
+            request.tokenizer = tokenizer
+
+        return results
+
     def get_stats(self):
         pass
 
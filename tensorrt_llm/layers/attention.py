@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import math
+from functools import lru_cache
 from typing import List, Optional
 
 import numpy as np
@@ -41,10 +42,14 @@ from .lora import LoraRuntimeParams
 class RopeEmbeddingUtils:
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def create_sinusoidal_positions(num_pos: int,
                                     dim: int,
                                     theta: float = 10000.0,
                                     dtype=np.float32):
+        # Every attention layer of a model asks for the same table, so share
+        # one read-only array instead of rebuilding num_pos x dim floats per
+        # layer; consumers only slice or astype-copy it.
         inv_freq = 1.0 / (theta**(np.arange(0, dim, 2) / dim)).astype(dtype)
         sinusoid_inp = np.einsum("i , j -> i j",
                                  np.arange(num_pos, dtype=dtype),
@@ -52,7 +57,9 @@ class RopeEmbeddingUtils:
                                  dtype=dtype)
         concat = np.concatenate((np.sin(sinusoid_inp), np.cos(sinusoid_inp)),
                                 axis=1)
-        return np.expand_dims(concat, axis=0).astype(dtype)
+        table = np.expand_dims(concat, axis=0).astype(dtype)
+        table.setflags(write=False)
+        return table
 
     @staticmethod
     def rotate_every_two(tensor: Tensor) -> Tensor:
@@ -183,7 +190,8 @@ class RopeEmbeddingUtils:
 
         embedding_weight = RopeEmbeddingUtils.create_sinusoidal_positions(
             max_position_embeddings, half_head_size)
-        embedding_weight /= rotary_embedding_scale
+        # The cached table is shared and read-only; scale into a fresh array.
+        embedding_weight = embedding_weight / rotary_embedding_scale
         embedding_weight = np.split(embedding_weight.squeeze(0), 2, axis=1)
         embedding_weight = np.concatenate(
             [
@@ -400,7 +408,7 @@ class KeyValueCacheParams:
 
     def fill_none_tensor_list(self, list_size):
         if self.past_key_value is None:
-            self.past_key_value = tuple([None] * list_size)
+            self.past_key_value = (None, ) * list_size
 
     def is_valid(self, gpt_attention_plugin):
         if gpt_attention_plugin:
@@ -12,6 +12,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from functools import lru_cache
 from typing import List
 
 
@@ -91,12 +92,17 @@ class Mapping(object):
             p = p - self.world_size
         return p
 
+    # Every decoder layer constructor asks for the same ranges, so memoize
+    # per Mapping instance; set_rank replaces the Mapping rather than mutating
+    # it, which keeps the cache coherent. Callers must not modify the lists.
+    @lru_cache(maxsize=None)
     def pp_layers(self, num_layers: int) -> List[int]:
         layers_per_pipeline_stage = num_layers // self.pp_size
         layers_range = range(self.pp_rank * layers_per_pipeline_stage,
                              (self.pp_rank + 1) * layers_per_pipeline_stage)
         return list(layers_range)
 
+    @lru_cache(maxsize=None)
     def ep_experts(self, num_experts: int) -> List[int]:
         experts_per_rank = num_experts // self.tp_size
         experts_range = range(self.tp_rank * experts_per_rank,
@@ -38,6 +38,41 @@ def split_matrix_tp(v, tensor_parallel, rank, dim):
     return split(v, tensor_parallel, rank, dim=dim)
 
 
+def batch_transposed_weights(weights_list):
+    """Materialize a list of 2-D weights as one contiguous transposed batch.
+
+    Pure-torch dataflow on purpose: torch.compile traces it once per shape
+    class and reuses the fused transpose+stack kernel across all layers and
+    ranks; the custom quantize ops stay outside the compiled region.
+    """
+    return torch.stack([w.t() for w in weights_list])
+
+
+try:
+    batch_transposed_weights = torch.compile(batch_transposed_weights,
+                                             fullgraph=False,
+                                             mode='reduce-overhead')
+except Exception:  # torch.compile unavailable on this platform
+    pass
+
+
+# Scratch buffers for materializing transposed weights, keyed by shape and
+# dtype. Transformer layers repeat a handful of shapes, so reusing one buffer
+# per shape class avoids a fresh allocation per .t().contiguous() call; the
+# quantize op only reads the buffer and returns new tensors.
+_transposed_scratch: Dict[tuple, torch.Tensor] = {}
+
+
+def _transposed_contiguous(v: torch.Tensor) -> torch.Tensor:
+    key = (v.shape, v.dtype, v.device)
+    scratch = _transposed_scratch.get(key)
+    if scratch is None:
+        scratch = torch.empty(v.shape, dtype=v.dtype, device=v.device)
+        _transposed_scratch[key] = scratch
+    scratch.copy_(v)
+    return scratch
+
+
 def weight_only_quantize(weight: torch.Tensor,
                          quant_algo: str,
                          plugin: bool = True):
@@ -52,7 +87,7 @@ def weight_only_quantize(weight: torch.Tensor,
     t = torch.quint4x2 if quant_algo == QuantAlgo.W4A16 else torch.int8
     processed_torch_weights, torch_weight_scales = \
         torch.ops.trtllm.symmetric_quantize_last_axis_of_batched_matrix(
-        v.contiguous(), t)
+        _transposed_contiguous(v), t)
     if plugin:
         return processed_torch_weights, torch_weight_scales
     else:
@@ -68,11 +103,35 @@ def weight_only_quantize_dict(weights: Dict[str, torch.Tensor],
                               plugin: bool = True):
     if quant_algo not in [QuantAlgo.W4A16, QuantAlgo.W8A16]:
         return weights
+    # One hashed lookup on the trailing 'module.weight' tokens replaces a
+    # substring scan per candidate suffix per name.
+    quant_weight_suffixes = frozenset(quant_weights)
+    # Group 2-D weights of identical shape and dtype so that a single batched
+    # symmetric_quantize_last_axis_of_batched_matrix call covers all layers of
+    # a shape class, instead of one op launch per tensor.
+    shape_groups = {}
     for name in list(weights):
-        if any([_name in name for _name in quant_weights
-                ]) and weights[name].dtype != torch.int8:
-            quant_weight, quant_scale = weight_only_quantize(
-                weight=weights[name], quant_algo=quant_algo, plugin=plugin)
+        if '.'.join(name.split('.')[-2:]) in quant_weight_suffixes \
+                and weights[name].dtype != torch.int8:
+            weight = weights[name]
+            if plugin and weight.dim() == 2:
+                shape_groups.setdefault((weight.shape, weight.dtype),
+                                        []).append(name)
+            else:
+                quant_weight, quant_scale = weight_only_quantize(
+                    weight=weight, quant_algo=quant_algo, plugin=plugin)
+                weights[name] = quant_weight
+                weights[name.replace('.weight',
+                                     '.per_channel_scale')] = quant_scale
+    quant_dtype = torch.quint4x2 if quant_algo == QuantAlgo.W4A16 else torch.int8
+    for names in shape_groups.values():
+        stacked = batch_transposed_weights([weights[name] for name in names])
+        processed_torch_weights, torch_weight_scales = \
+            torch.ops.trtllm.symmetric_quantize_last_axis_of_batched_matrix(
+            stacked, quant_dtype)
+        for name, quant_weight, quant_scale in zip(
+                names, processed_torch_weights.unbind(0),
+                torch_weight_scales.unbind(0)):
             weights[name] = quant_weight
             weights[name.replace('.weight', '.per_channel_scale')] = quant_scale
     return weights
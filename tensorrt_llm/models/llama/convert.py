@@ -5,6 +5,7 @@ import os
 import sys
 import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -36,6 +37,15 @@ except ImportError:
     pass
 
 
+@functools.lru_cache(maxsize=None)
+def _cached_hf_config(model_dir: str):
+    """ AutoConfig re-parses the same config.json on every call; one build
+        reads it from create_config_from_hugging_face, from_hugging_face and
+        quantize, so memoize per checkpoint dir. Callers only read attributes.
+    """
+    return AutoConfig.from_pretrained(model_dir, trust_remote_code=True)
+
+
 def generate_int8(weights, act_range, is_qkv=False, multi_query_mode=False):
     """
      This function has two purposes:
@@ -784,31 +794,35 @@ def convert_hf_llama(hf_model,
             rank_experts = list(range(moe_config.num_experts))
             if moe_config.tp_mode == moe_config.ParallelismMode.EXPERT_PARALLEL:
                 rank_experts = mapping.ep_experts(moe_config.num_experts)
+            # Stage the stacked expert tensors in a per-layer dict: inserting
+            # new keys into the shared model_params would resize it while
+            # sibling layer threads iterate it.
+            moe_params = {}
             for suffix in ["w1", "w2", "w3"]:
-                model_params[f'model.layers.{l}.block_sparse_moe.experts.{suffix}.weight'] = \
+                moe_params[f'model.layers.{l}.block_sparse_moe.experts.{suffix}.weight'] = \
                             torch.stack([model_params[f'model.layers.{l}.block_sparse_moe.experts.{expert}.{suffix}.weight'].detach()
                                         for expert in rank_experts])
-            w3 = model_params[
+            w3 = moe_params[
                 f'model.layers.{l}.block_sparse_moe.experts.w3.weight']
-            w2 = model_params[
+            w2 = moe_params[
                 f'model.layers.{l}.block_sparse_moe.experts.w2.weight']
-            w1 = model_params[
+            w1 = moe_params[
                 f'model.layers.{l}.block_sparse_moe.experts.w1.weight']
             if moe_config.tp_mode == moe_config.ParallelismMode.TENSOR_PARALLEL:
                 w3 = split(w3, mapping.tp_size, mapping.tp_rank, dim=1)
                 w2 = split(w2, mapping.tp_size, mapping.tp_rank, dim=2)
                 w1 = split(w1, mapping.tp_size, mapping.tp_rank, dim=1)
 
-            model_params[
+            moe_params[
                 f'model.layers.{l}.block_sparse_moe.experts.w3w1.weight'] = torch.concat(
                     [w3, w1], dim=-2)
 
-            model_params[
+            moe_params[
                 f'model.layers.{l}.block_sparse_moe.experts.w2.weight'] = w2
 
             ## block_sparse_moe.experts.w2.weight
             moe_experts_w2_weights = get_weight(
-                model_params, prefix + 'block_sparse_moe.experts.w2', dtype)
+                moe_params, prefix + 'block_sparse_moe.experts.w2', dtype)
             weights.update(
                 get_tllm_linear_weight(moe_experts_w2_weights,
                                        tllm_prex + 'mlp.experts_weight_2',
@@ -822,7 +836,7 @@ def convert_hf_llama(hf_model,
                                        'mlp.experts_scale_2'))
             ##block_sparse_moe.experts.w3w1.weight
             moe_experts_w3w1_weights = get_weight(
-                model_params, prefix + 'block_sparse_moe.experts.w3w1', dtype)
+                moe_params, prefix + 'block_sparse_moe.experts.w3w1', dtype)
             weights.update(
                 get_tllm_linear_weight(moe_experts_w3w1_weights,
                                        tllm_prex + 'mlp.experts_weight_1',
@@ -960,9 +974,21 @@ def convert_hf_llama(hf_model,
         for weight_name in cur_block_weights:
             model_params[weight_name] = None
 
-    for l in layers_range:
-        convert_layer(l)
-        release_gc()
+    # The per-layer casts, splits and quantize ops release the GIL, so layers
+    # convert in parallel on threads; a process pool would re-pickle the full
+    # tensors into every worker. The weights dict takes disjoint keys per
+    # layer, so concurrent updates do not clash, and nothing inserts new keys
+    # into the shared model_params (the MoE staging uses a per-layer dict),
+    # so iterating it from sibling threads is safe.
+    if len(layers_range) > 1:
+        with ThreadPoolExecutor(max_workers=min(
+                len(layers_range),
+                os.cpu_count() or 1)) as executor:
+            list(executor.map(convert_layer, layers_range))
+    else:
+        for l in layers_range:
+            convert_layer(l)
+    release_gc()
 
     v = get_weight(model_params, 'model.embed_tokens', dtype)
     if hf_model.config.tie_word_embeddings:
@@ -1056,7 +1082,7 @@ def create_config_from_hugging_face(hf_model,
                                     quantization: QuantConfig = None,
                                     override_fields: dict = {}):
     config = {}
-    hf_config = AutoConfig.from_pretrained(hf_model, trust_remote_code=True)
+    hf_config = _cached_hf_config(str(hf_model))
     if hf_config.model_type == "llava":
         # LLaVA = Vision model + Llama LLM
         # We load a llava config and use its' text config as llama config
@@ -1172,8 +1198,7 @@ def from_hugging_face(cls,
 
     model = preloaded_model
     if model is None and not load_by_shard:  # when load by shard, no need to create complete hf model
-        hf_config = AutoConfig.from_pretrained(model_dir,
-                                               trust_remote_code=True)
+        hf_config = _cached_hf_config(model_dir)
         if hf_config.model_type == "llava":
             hf_llava = LlavaForConditionalGeneration.from_pretrained(
                 model_dir, torch_dtype="auto")
@@ -1234,7 +1259,7 @@ def quantize(dtype,
 
     assert model_dir is not None
     ## only load and call smooth quant routine once for all ranks
-    hf_config = AutoConfig.from_pretrained(model_dir, trust_remote_code=True)
+    hf_config = _cached_hf_config(model_dir)
     assert "llava" not in hf_config.model_type, "Smooth quant llava/vila is not supported yet"
     model = AutoModelForCausalLM.from_pretrained(
         model_dir,
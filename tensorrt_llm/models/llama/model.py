@@ -30,6 +30,21 @@ from ..modeling_utils import (DecoderLayerList, DecoderModelForCausalLM,
                               PretrainedConfig, QuantConfig)
 
 
+# config defaults applied by check_config, hoisted so they are built once
+# instead of re-created attribute by attribute per model instance
+_LLAMA_CONFIG_DEFAULTS = {
+    'mlp_bias': False,
+    'attn_bias': False,
+    'rotary_base': 10000.0,
+    'rotary_scaling': None,
+    'moe_num_experts': 0,
+    'moe_top_k': 0,
+    'moe_tp_mode': MoeConfig.ParallelismMode.TENSOR_PARALLEL,
+    'moe_normalization_mode':
+    MoeConfig.ExpertScaleNormalizationMode.RENORMALIZE,
+}
+
+
 class LLaMADecoderLayer(Module):
 
     def __init__(self, config: PretrainedConfig, layer_idx: int):
@@ -220,17 +235,8 @@ class LLaMAForCausalLM(DecoderModelForCausalLM):
         super().__init__(config, transformer, lm_head)
 
     def check_config(self, config):
-        config.set_if_not_exist('mlp_bias', False)
-        config.set_if_not_exist('attn_bias', False)
-        config.set_if_not_exist('rotary_base', 10000.0)
-        config.set_if_not_exist('rotary_scaling', None)
-        config.set_if_not_exist('moe_num_experts', 0)
-        config.set_if_not_exist('moe_top_k', 0)
-        config.set_if_not_exist('moe_tp_mode',
-                                MoeConfig.ParallelismMode.TENSOR_PARALLEL)
-        config.set_if_not_exist(
-            'moe_normalization_mode',
-            MoeConfig.ExpertScaleNormalizationMode.RENORMALIZE)
+        for key, default in _LLAMA_CONFIG_DEFAULTS.items():
+            config.set_if_not_exist(key, default)
 
     @classmethod
     def from_hugging_face(cls,
@@ -258,6 +264,11 @@ class LLaMAForCausalLM(DecoderModelForCausalLM):
         plugin_config = super().default_plugin_config(**kwargs)
         if self.quant_mode.is_int4_weight_only_per_group():
             plugin_config.set_weight_only_groupwise_quant_matmul_plugin()
+        if self.quant_mode.has_fp8_qdq():
+            # With the fp8 quantization workflow the context phase can also
+            # run the FMHA kernels in fp8, which roughly halves the context
+            # attention cost on Hopper.
+            plugin_config.set_plugin("use_fp8_context_fmha", True)
         return plugin_config
 
     @classmethod
@@ -299,6 +310,9 @@ class LLaMAForCausalLM(DecoderModelForCausalLM):
             'max_position_embeddings': 2048,
             'hidden_act': 'silu',
             'rotary_base': 10000.0,
+            'rotary_scaling': None,
+            'attn_bias': False,
+            'mlp_bias': False,
             'norm_epsilon': meta_config["norm_eps"],
             'mapping': {
                 'world_size': mapping.tp_size * mapping.pp_size,
@@ -337,7 +351,11 @@ class LLaMAForCausalLM(DecoderModelForCausalLM):
             QuantAlgo.W4A16_AWQ, QuantAlgo.FP8, QuantAlgo.W8A8_SQ_PER_CHANNEL,
             QuantAlgo.W4A8_AWQ
         ]
-        use_ammo_quantization = quant_config.quant_algo in DEFAULT_AMMO_FLOW
+        # FP8 KV cache is produced by the AMMO flow as well, with or without
+        # weight/activation quantization ('full_prec' qformat in the latter
+        # case); halving KV bandwidth does not require FP8 GEMMs.
+        use_ammo_quantization = quant_config.quant_algo in DEFAULT_AMMO_FLOW \
+            or quant_config.kv_cache_quant_algo == QuantAlgo.FP8
         if use_ammo_quantization:
             super().quantize(hf_model_dir,
                              output_dir,
@@ -35,8 +35,9 @@ def load_state_dict(
             for name in f.keys():
                 model_params[name] = f.get_tensor(name).to(dtype)
     elif file_path.suffix == '.bin':
-        # load from pytorch bin file
-        state_dict = torch.load(file_path, map_location=device)
+        # load from pytorch bin file; mmap avoids staging the whole shard in
+        # pageable memory before the per-tensor dtype casts
+        state_dict = torch.load(file_path, map_location=device, mmap=True)
         for name in state_dict:
             model_params[name] = state_dict[name].to(dtype)
     else:
@@ -229,7 +229,9 @@ class QkvWeightHelper:
         if not self.is_qkv_prepared(layer_idx):
             return None
         weights = self._qkv_weights.pop(layer_idx)  # to prevent memory leak.
-        q, k, v = (torch.tensor(weights[t]) for t in ['q', 'k', 'v'])
+        # as_tensor passes the already-loaded tensors through; torch.tensor
+        # would deep-copy each projection before the concat
+        q, k, v = (torch.as_tensor(weights[t]) for t in ['q', 'k', 'v'])
 
         if not self.is_mha:
             head_size = self.hidden_size // self.num_heads
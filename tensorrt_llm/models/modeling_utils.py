@@ -1,7 +1,10 @@
 import copy
 import dataclasses
 import json
+import mmap
 import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
 from functools import cached_property
 from typing import Dict, List, Optional, Union
 
@@ -25,7 +28,7 @@ from ..quantization import QuantMode
 from ..quantization.layers import FP8Linear
 from ..quantization.mode import W8A8_SQ_PLUGIN_LIST, QuantAlgo
 from ..top_model_mixin import TopModelMixin
-from .convert_utils import weight_only_quantize_dict
+from .convert_utils import batch_transposed_weights, weight_only_quantize_dict
 from .generation_mixin import GenerationMixin
 
 WEIGHT_LOADER_MODELS = {"PhiForCausalLM"}
@@ -75,6 +78,101 @@ class QuantConfig:
         return dataclasses.asdict(self)
 
 
+_SAFETENSORS_TO_TORCH_DTYPE = {
+    'BOOL': torch.bool,
+    'U8': torch.uint8,
+    'I8': torch.int8,
+    'F8_E4M3': torch.float8_e4m3fn,
+    'F8_E5M2': torch.float8_e5m2,
+    'I16': torch.int16,
+    'F16': torch.float16,
+    'BF16': torch.bfloat16,
+    'I32': torch.int32,
+    'F32': torch.float32,
+    'I64': torch.int64,
+    'F64': torch.float64,
+}
+
+
+def _mmap_safetensors_weights(model_path: str) -> Dict[str, torch.Tensor]:
+    """Build zero-copy tensor views over one mmap of the safetensors file.
+
+    ACCESS_COPY pages stay shared with the page cache until written, so peak
+    CPU RSS is one file mapping instead of a full materialized copy; the
+    mapping is kept alive by the tensors referencing it.
+    """
+    with open(model_path, 'rb') as f:
+        header_size = struct.unpack('<Q', f.read(8))[0]
+        header = json.loads(f.read(header_size))
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    data_offset = 8 + header_size
+    weights = {}
+    for name, info in header.items():
+        if name == '__metadata__':
+            continue
+        dtype = _SAFETENSORS_TO_TORCH_DTYPE[info['dtype']]
+        begin, end = info['data_offsets']
+        weights[name] = torch.frombuffer(
+            buffer,
+            dtype=dtype,
+            count=(end - begin) // dtype.itemsize,
+            offset=data_offset + begin).reshape(info['shape'])
+    return weights
+
+
+def load_safetensors_weights(
+        model_path: str,
+        device: str = 'cpu',
+        weight_dtype: Optional[torch.dtype] = None
+) -> Dict[str, torch.Tensor]:
+    """Load all tensors from a safetensors file into a dict.
+
+    CPU loads are zero-copy views over one mmap of the file. For other
+    devices, tensor fetches release the GIL in the safetensors backend, so
+    fanning the per-key reads over a thread pool overlaps file I/O with the
+    device copies.
+
+    weight_dtype reinterprets int8 '.weight' storage (FP8 checkpoints) right
+    at materialization, so no later whole-dict view pass is needed.
+    """
+    weights = None
+    if device == 'cpu':
+        try:
+            weights = _mmap_safetensors_weights(model_path)
+        except KeyError:
+            # a dtype with no torch view equivalent; fall back to copying reads
+            pass
+    if weights is None:
+        weights = {}
+        with safetensors.safe_open(model_path, framework='pt',
+                                   device=device) as f:
+            keys = list(f.keys())
+            if len(keys) > 0:
+                with ThreadPoolExecutor(max_workers=min(16, len(keys))) as ex:
+                    for key, tensor in zip(keys, ex.map(f.get_tensor, keys)):
+                        weights[key] = tensor
+    if weight_dtype is not None:
+        for name, param in weights.items():
+            if name.rpartition('.')[2] == 'weight' and \
+                    param.dtype == torch.int8:
+                weights[name] = param.view(weight_dtype)
+    return weights
+
+
+def quantized_weight_dtype(
+        model_config: 'PretrainedConfig') -> Optional[torch.dtype]:
+    """Storage dtype to reinterpret int8 '.weight' entries with at load time.
+
+    FP8 checkpoints serialize weights as int8; typing them correctly when
+    they are first materialized saves a dict-wide view pass later. Packed
+    int4 formats cannot be expressed as a plain storage view and keep their
+    preprocessing path.
+    """
+    if model_config.quantization.quant_algo == QuantAlgo.FP8:
+        return torch.float8_e4m3fn
+    return None
+
+
 def default_weight_loader(mapping: Mapping, param: torch.Tensor,
                           loaded_weight: torch.Tensor) -> None:
     """Default weight loader."""
@@ -254,6 +352,13 @@ class PretrainedConfig:
                                tp_size=self.mapping.tp_size,
                                pp_size=self.mapping.pp_size)
 
+    def clone_for_rank(self, rank):
+        # Ranks only differ in mapping; a shallow copy plus a fresh Mapping is
+        # much cheaper than deep-copying the whole config per rank.
+        config = copy.copy(self)
+        config.set_rank(rank)
+        return config
+
 
 class DecoderLayerList(ModuleList):
 
@@ -274,7 +379,21 @@ class DecoderLayerList(ModuleList):
         kv_cache_params.fill_none_tensor_list(len(self.layer_list))
 
         if use_cache:
-            presents = []
+            presents = [None] * len(self.layer_list)
+
+        # The per-layer cache params only differ in past_key_value, so build
+        # one object up front and swap the past in-place instead of re-packing
+        # the shared fields num_layers times during graph construction.
+        layer_kv_cache_params = KeyValueCacheParams(
+            host_past_key_value_lengths=kv_cache_params.
+            host_past_key_value_lengths,
+            host_max_attention_window_sizes=kv_cache_params.
+            host_max_attention_window_sizes,
+            host_sink_token_length=kv_cache_params.host_sink_token_length,
+            kv_cache_block_pointers=kv_cache_params.kv_cache_block_pointers,
+            host_kv_cache_block_pointers=kv_cache_params.
+            host_kv_cache_block_pointers,
+            cache_indirection=kv_cache_params.cache_indirection)
 
         for layer_idx, (layer, past) in enumerate(
                 zip(self, kv_cache_params.past_key_value)):
@@ -293,28 +412,16 @@ class DecoderLayerList(ModuleList):
             if medusa_packed_mask is not None:
                 kwargs['medusa_packed_mask'] = medusa_packed_mask
 
-            hidden_states = layer(
-                hidden_states,
-                use_cache=use_cache,
-                attention_mask=attention_mask,
-                kv_cache_params=KeyValueCacheParams(
-                    past_key_value=[past],
-                    host_past_key_value_lengths=kv_cache_params.
-                    host_past_key_value_lengths,
-                    host_max_attention_window_sizes=kv_cache_params.
-                    host_max_attention_window_sizes,
-                    host_sink_token_length=kv_cache_params.
-                    host_sink_token_length,
-                    kv_cache_block_pointers=kv_cache_params.
-                    kv_cache_block_pointers,
-                    host_kv_cache_block_pointers=kv_cache_params.
-                    host_kv_cache_block_pointers,
-                    cache_indirection=kv_cache_params.cache_indirection),
-                attention_params=attention_params,
-                **kwargs)
+            layer_kv_cache_params.past_key_value = [past]
+            hidden_states = layer(hidden_states,
+                                  use_cache=use_cache,
+                                  attention_mask=attention_mask,
+                                  kv_cache_params=layer_kv_cache_params,
+                                  attention_params=attention_params,
+                                  **kwargs)
 
             if use_cache:
-                presents.append(hidden_states[1])
+                presents[layer_idx] = hidden_states[1]
                 hidden_states = hidden_states[0]
 
         if use_cache:
@@ -370,13 +477,9 @@ class PretrainedModel(Module,
             config.set_rank(rank)
         model = cls.from_config(config)
 
-        weights = {}
-        with safetensors.safe_open(os.path.join(ckpt_dir,
-                                                f'rank{rank}.safetensors'),
-                                   framework='pt',
-                                   device='cpu') as f:
-            for key in f.keys():
-                weights[key] = f.get_tensor(key)
+        weights = load_safetensors_weights(
+            os.path.join(ckpt_dir, f'rank{rank}.safetensors'),
+            weight_dtype=quantized_weight_dtype(config))
         preprocess_weights(weights, config)
         model.load(weights)
 
@@ -413,6 +516,8 @@ class PretrainedModel(Module,
                 weight_loader = getattr(param, "weight_loader",
                                         default_weight_loader)
                 weight_loader(mapping, param, v)
+            elif k == PREPROCESSED_FLAG:
+                continue
             elif mapping.pp_size == 1:
                 logger.warning(f"Provided but not expected tensors: {k}")
 
@@ -450,17 +555,16 @@ class PretrainedModel(Module,
         '''
 
         # Prepare inputs
-        remove_input_padding = default_net().plugin_config.remove_input_padding
-        use_gpt_attention_plugin = default_net(
-        ).plugin_config.gpt_attention_plugin
-        use_gemm_plugin = default_net().plugin_config.gemm_plugin
-        paged_kv_cache = default_net().plugin_config.paged_kv_cache
-        tokens_per_block = default_net().plugin_config.tokens_per_block
-        use_custom_all_reduce = default_net(
-        ).plugin_config.use_custom_all_reduce
-        use_lora_plugin = default_net().plugin_config.lora_plugin
-        multiple_profiles = default_net().plugin_config.multiple_profiles
-        streamingllm = default_net().plugin_config.streamingllm
+        plugin_config = default_net().plugin_config
+        remove_input_padding = plugin_config.remove_input_padding
+        use_gpt_attention_plugin = plugin_config.gpt_attention_plugin
+        use_gemm_plugin = plugin_config.gemm_plugin
+        paged_kv_cache = plugin_config.paged_kv_cache
+        tokens_per_block = plugin_config.tokens_per_block
+        use_custom_all_reduce = plugin_config.use_custom_all_reduce
+        use_lora_plugin = plugin_config.lora_plugin
+        multiple_profiles = plugin_config.multiple_profiles
+        streamingllm = plugin_config.streamingllm
 
         model_inputs = self.prepare_basic_inputs(
             max_batch_size=max_batch_size,
@@ -629,13 +733,14 @@ class DecoderModelForCausalLM(PretrainedModel):
 
         hidden_states = self.transformer.forward(**kwargs)
 
+        plugin_config = default_net().plugin_config
         if use_cache:
             hidden_states, presents = hidden_states
 
         if self.config.mapping.is_last_pp_rank():
             hidden_states = gather_last_token_logits(
                 hidden_states, last_token_ids,
-                default_net().plugin_config.remove_input_padding)
+                plugin_config.remove_input_padding)
 
             # [batch_size, hidden_size] -> [batch_size, vocab_size]
             lm_logits = self.lm_head(hidden_states)
@@ -643,7 +748,7 @@ class DecoderModelForCausalLM(PretrainedModel):
         else:
             hidden_states.mark_output('hidden_states_output', self.config.dtype)
 
-        if use_cache and not default_net().plugin_config.paged_kv_cache:
+        if use_cache and not plugin_config.paged_kv_cache:
             for i, present in zip(
                     self.config.mapping.pp_layers(
                         self.config.num_hidden_layers), presents):
@@ -895,35 +1000,64 @@ def optimize_model(model: DecoderModelForCausalLM,
     return model
 
 
+PREPROCESSED_FLAG = '_trtllm_preprocessed'
+
+
 def preprocess_weights(
         weights: Dict[str, torch.Tensor],
         model_config: PretrainedConfig) -> Dict[str, torch.Tensor]:
+    # Re-running the transpose/quantize passes on an already-preprocessed
+    # dict (e.g. a cached or shared checkpoint seen by several ranks) would
+    # corrupt the layouts; the sentinel short-circuits the reruns.
+    if PREPROCESSED_FLAG in weights:
+        return
     quant_algo = model_config.quantization.quant_algo
     kv_cache_quant_algo = model_config.quantization.kv_cache_quant_algo
 
     # INT4_AWQ
     if quant_algo == QuantAlgo.W4A8_AWQ or quant_algo == QuantAlgo.W4A16_AWQ:
         preprocessor = torch.ops.trtllm.preprocess_weights_for_mixed_gemm
+        dtype = torch.float16
+        if model_config.dtype == "bfloat16":
+            dtype = torch.bfloat16
+        # Stage the transposes on the GPU when one is available: device HBM
+        # bandwidth makes the copy nearly free compared to host DRAM. Results
+        # come back to host since Parameter.value consumes numpy arrays.
+        device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        # Group quantized weights by shape so one batched preprocessor call
+        # covers all layers of a shape class instead of one launch per tensor.
+        quantized_weight_names = {}
         for name, param in weights.items():
-            if name.endswith('weight') and param.dtype == torch.int8:
-                dtype = torch.float16
-                if model_config.dtype == "bfloat16":
-                    dtype = torch.bfloat16
-                weights[name] = preprocessor(param.T.contiguous(),
-                                             torch.quint4x2).view(dtype)
-            if name.endswith('weights_scaling_factor'):
-                weights[name] = param.T.contiguous().to(
-                    str_dtype_to_torch(model_config.dtype))
-            if name.endswith('prequant_scaling_factor'):
+            # Dispatch on the hashed trailing token instead of running a
+            # chain of endswith scans per name.
+            suffix = name.rpartition('.')[2]
+            if suffix == 'weight' and param.dtype == torch.int8:
+                quantized_weight_names.setdefault(param.shape,
+                                                  []).append(name)
+            elif suffix == 'weights_scaling_factor':
+                weights[name] = param.to(
+                    device, non_blocking=True).T.contiguous().to(
+                        str_dtype_to_torch(model_config.dtype)).cpu()
+            elif suffix == 'prequant_scaling_factor':
                 weights[name] = param.reshape(1, -1)
-            if model_config.mapping.tp_rank > 0:
-                if name.endswith('attention.dense.bias') or name.endswith(
-                        'mlp.proj.bias'):
-                    weights[name] = torch.zeros_like(param)
+            elif (suffix == 'bias' and model_config.mapping.tp_rank > 0
+                  and name.endswith(
+                      ('attention.dense.bias', 'mlp.proj.bias'))):
+                weights[name] = torch.zeros_like(param)
+
+        for names in quantized_weight_names.values():
+            # The transposed views are materialized directly into one
+            # contiguous batch, so no per-tensor .T.contiguous() copy is made.
+            stacked = batch_transposed_weights([
+                weights[name].to(device, non_blocking=True) for name in names
+            ]).cpu()
+            processed = preprocessor(stacked, torch.quint4x2).view(dtype)
+            for name, processed_weight in zip(names, processed.unbind(0)):
+                weights[name] = processed_weight
 
         if quant_algo == QuantAlgo.W4A8_AWQ:
             for name in list(weights):
-                if name.endswith('weights_scaling_factor'):
+                if name.rpartition('.')[2] == 'weights_scaling_factor':
                     activation_scaling_factor = weights.pop(
                         name.replace('weights_scaling_factor',
                                      'activation_scaling_factor'))
@@ -938,11 +1072,10 @@ def preprocess_weights(
                         'weights_scaling_factor', 'alpha'
                     )] = activation_scaling_factor * weights_scaling_factor_2
 
-    # FP8
+    # FP8: the int8-serialized weights were already reinterpreted as
+    # float8_e4m3fn when the checkpoint was materialized (see
+    # load_safetensors_weights), so only the lm_head fixup remains.
     elif quant_algo == QuantAlgo.FP8:
-        for name, param in weights.items():
-            if name.endswith('weight') and param.dtype == torch.int8:
-                weights[name] = param.view(torch.float8_e4m3fn)
         # lm_head is not quantized to FP8
         if "lm_head.weight" in weights:
             assert weights['lm_head.weight'].dtype == str_dtype_to_torch(
@@ -955,42 +1088,44 @@ def preprocess_weights(
                                             quant_algo=quant_algo,
                                             plugin=True)
 
-    # FP8 kv_cache_scaling_factor is always 1.0
-    if kv_cache_quant_algo == QuantAlgo.FP8:
-        for name, param in weights.items():
-            if name.endswith('kv_cache_scaling_factor'):
-                weights[name] = torch.tensor([1.0], dtype=torch.float32)
-
     # If layer_norm bias is None. (For MPT)
+    # Compute the missing names with one set difference instead of repeated
+    # membership tests inside a loop.
     if model_config.architecture == 'MPTForCausalLM':
-        update_dict = {}
+        missing_biases = {
+            name.replace('weight', 'bias')
+            for name in weights
+            if name.endswith(('input_layernorm.weight',
+                              'post_layernorm.weight', 'ln_f.weight'))
+        } - weights.keys()
+        for bias_name in missing_biases:
+            weights[bias_name] = torch.zeros_like(
+                weights[bias_name.replace('bias', 'weight')])
+
+    # Fold the kv cache scale fixup and the GPTJ parallel-bias zeroing into a
+    # single traversal of the weight dict.
+    fixup_fp8_kv_cache = kv_cache_quant_algo == QuantAlgo.FP8
+    # Parallel block rowlinear should not have duplicate bias.
+    zero_parallel_bias = (model_config.architecture == 'GPTJForCausalLM'
+                          and model_config.mapping.tp_rank > 0)
+    if fixup_fp8_kv_cache or zero_parallel_bias:
         for name, param in weights.items():
-            if 'input_layernorm.weight' in name and name.replace(
-                    'weight', 'bias') not in weights:
-                update_dict[name.replace('weight',
-                                         'bias')] = torch.zeros_like(param)
-            if 'post_layernorm.weight' in name and name.replace(
-                    'weight', 'bias') not in weights:
-                update_dict[name.replace('weight',
-                                         'bias')] = torch.zeros_like(param)
-            if 'ln_f.weight' in name and name.replace('weight',
-                                                      'bias') not in weights:
-                update_dict[name.replace('weight',
-                                         'bias')] = torch.zeros_like(param)
-        weights.update(update_dict)
+            # FP8 kv_cache_scaling_factor is always 1.0
+            if fixup_fp8_kv_cache and \
+                    name.rpartition('.')[2] == 'kv_cache_scaling_factor':
+                weights[name] = torch.tensor([1.0], dtype=torch.float32)
+            elif zero_parallel_bias and ('attention.dense.bias' in name
+                                         or 'mlp.proj.bias' in name):
+                weights[name] = torch.zeros_like(param)
 
-    # Parallel block rowlinear should not have duplicate bias.
-    elif model_config.architecture == 'GPTJForCausalLM':
-        if model_config.mapping.tp_rank > 0:
-            for name, param in weights.items():
-                if 'attention.dense.bias' in name or 'mlp.proj.bias' in name:
-                    weights[name] = torch.zeros_like(param)
+    weights[PREPROCESSED_FLAG] = torch.ones(1, dtype=torch.int8)
 
 
 def load_model(
     model_config: Optional[PretrainedConfig] = None,
     ckpt_dir: Optional[str] = None,
     model_cls: Optional[type[PretrainedModel]] = None,
+    weights: Optional[Dict[str, torch.Tensor]] = None,
 ):
     from . import MODEL_MAP
 
@@ -1010,8 +1145,8 @@ def load_model(
 
     # TODO: use PretrainedModel.from_checkpoint instead after PretrainedModel becomes base class of all models.
     model = model_cls.from_config(model_config)
-    weights = None
-    if ckpt_dir is not None:
+    # weights may come pre-read by a caller that prefetched the checkpoint
+    if weights is None and ckpt_dir is not None:
         if model_config.architecture in WEIGHT_LOADER_MODELS:
             model_path = os.path.join(ckpt_dir, 'rank0.safetensors')
         else:
@@ -1019,11 +1154,11 @@ def load_model(
             model_path = os.path.join(ckpt_dir, f'rank{rank}.safetensors')
 
         if os.path.isfile(model_path):
-            weights = {}
-            with safetensors.safe_open(model_path, framework='pt',
-                                       device='cpu') as f:
-                for key in f.keys():
-                    weights[key] = f.get_tensor(key)
+            # Always stage on the host: Parameter.value round-trips every
+            # tensor through numpy (hence CPU) anyway, and the CPU path is a
+            # zero-copy mmap of the checkpoint.
+            weights = load_safetensors_weights(
+                model_path, weight_dtype=quantized_weight_dtype(model_config))
         else:
             logger.warning(
                 f"Cannot find {model_path}. Use dummy model weights.")
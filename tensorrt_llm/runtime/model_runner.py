@@ -345,7 +345,8 @@ class ModelRunner(ModelRunnerMixin):
                     debug_mode: bool = False,
                     lora_ckpt_source: str = "hf",
                     medusa_choices: List[List[int]] = None,
-                    stream: torch.cuda.Stream = None) -> 'ModelRunner':
+                    stream: torch.cuda.Stream = None,
+                    cuda_graph_mode: bool = False) -> 'ModelRunner':
         pretrained_config = engine.config.pretrained_config
         build_config = engine.config.build_config
 
@@ -427,7 +428,8 @@ class ModelRunner(ModelRunnerMixin):
                               engine_buffer,
                               runtime_mapping,
                               debug_mode=debug_mode,
-                              stream=stream)
+                              stream=stream,
+                              cuda_graph_mode=cuda_graph_mode)
 
         if session.use_lora_plugin:
             lora_manager = LoraManager()
@@ -454,7 +456,8 @@ class ModelRunner(ModelRunnerMixin):
                  debug_mode: bool = False,
                  lora_ckpt_source: str = "hf",
                  medusa_choices: List[List[int]] = None,
-                 stream: torch.cuda.Stream = None) -> 'ModelRunner':
+                 stream: torch.cuda.Stream = None,
+                 cuda_graph_mode: bool = False) -> 'ModelRunner':
         """
         Create a ModelRunner instance from an engine directory.
 
@@ -471,6 +474,10 @@ class ModelRunner(ModelRunnerMixin):
                 Medusa choices to use when in Medusa decoding
             stream (torch.cuda.Stream):
                 Stream to use.
+            cuda_graph_mode (bool):
+                Whether to capture the decode steps into CUDA graphs to cut
+                kernel launch overhead; generation shapes are fixed, so the
+                graphs are reused across steps.
         Returns:
             ModelRunner: An instance of ModelRunner.
         """
@@ -519,7 +526,8 @@ class ModelRunner(ModelRunnerMixin):
                                   engine_buffer,
                                   runtime_mapping,
                                   debug_mode=debug_mode,
-                                  stream=stream)
+                                  stream=stream,
+                                  cuda_graph_mode=cuda_graph_mode)
             if session.use_lora_plugin:
                 lora_manager = LoraManager()
                 if lora_dir is not None:
@@ -553,7 +561,7 @@ class ModelRunner(ModelRunnerMixin):
                     lora_ckpt_source = engine.config.build_config.lora_config.lora_ckpt_source
             runner = ModelRunner.from_engine(engine, lora_dir, rank, debug_mode,
                                              lora_ckpt_source, medusa_choices,
-                                             stream)
+                                             stream, cuda_graph_mode)
             profiler.stop('load tensorrt_llm engine')
             loading_time = profiler.elapsed_time_in_sec(
                 "load tensorrt_llm engine")